@@ -3,78 +3,334 @@
 AFGC Issuance Pack Generator v1.2
 
 Generates PDF/A-2b compliant certification issuance packs for approved certifications.
-Reads from Airtable Certification_Registry, generates PDFs and ZIPs, commits to /packs/ for
+Reads from Airtable Certification_Registry, generates PDFs and manifests, commits to /packs/ for
 GitHub Pages serving, and updates status fields.
 
+ZIP archives are only built when AFGC_GENERATE_ZIP=1. GitHub Pages already serves the PDF and
+MANIFEST.txt individually, so the ZIP duplicates both in git history and Pages storage and costs
+an extra compression and hashing pass per pack.
+
+Pending records are selected with PENDING_FORMULA. Setting AIRTABLE_PENDING_VIEW to the name of
+an Airtable view (e.g. "Pending Issuance") narrows the query to that view; PENDING_FORMULA is
+still applied within it, so a misconfigured view cannot cause packs to be reissued.
+
 Output URL format: https://ttony106-source.github.io/afgc-registry/packs/<Certification_ID>/<file>
 
 OPS RULE: Never delete or modify existing pack files. If correction needed, revoke + reissue.
 """
 
+import argparse
 import os
 import sys
 import hashlib
+import json
+import shlex
 import subprocess
+import tempfile
+import time
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from functools import lru_cache
+from io import BytesIO, RawIOBase
 from pathlib import Path
+from typing import NamedTuple, Optional
+from xml.sax.saxutils import escape
+
+def _positive_int(value: str) -> int:
+    try:
+        n = int(value)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return n
 
-try:
-    from pyairtable import Api
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib import colors
-    import pikepdf
-except ImportError as e:
-    print(f"Missing dependency: {e}")
-    print("Install with: pip install pyairtable reportlab pikepdf")
-    sys.exit(1)
+
+def _non_empty(value: str) -> str:
+    if not value.strip():
+        raise argparse.ArgumentTypeError("must not be empty")
+    return value
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse the command line; unknown or incomplete options exit instead of falling back to a live run."""
+    parser = argparse.ArgumentParser(description="Generate AFGC issuance packs for pending certifications.", allow_abbrev=False)
+    parser.add_argument('--use-cache', action='store_true',
+                        help="serve recent Airtable results from .cache/ (same as AFGC_USE_CACHE=true)")
+    parser.add_argument('-j', '--jobs', type=_positive_int, default=os.environ.get('AFGC_JOBS') or None,
+                        help="worker processes for PDF rendering (default: AFGC_JOBS, else the CPU count)")
+    parser.add_argument('--records-json', type=_non_empty, metavar='PATH',
+                        help="replay records from a JSON file instead of querying Airtable")
+    return parser.parse_args()
+
+
+ARGS = _parse_args()
 
 # Configuration from environment
 AIRTABLE_API_KEY = os.environ.get('AIRTABLE_API_KEY')
 AIRTABLE_BASE_ID = os.environ.get('AIRTABLE_BASE_ID')
 AIRTABLE_TABLE_ID = os.environ.get('AIRTABLE_TABLE_ID')
+AIRTABLE_PENDING_VIEW = os.environ.get('AIRTABLE_PENDING_VIEW')
 DRY_RUN = os.environ.get('DRY_RUN', 'false').lower() == 'true'
+AFGC_USE_CACHE = os.environ.get('AFGC_USE_CACHE', 'false').lower() == 'true' or ARGS.use_cache
+AFGC_CACHE_TTL = float(os.environ.get('AFGC_CACHE_TTL', '60'))
+AFGC_GENERATE_ZIP = os.environ.get('AFGC_GENERATE_ZIP', '0') == '1'
+AFGC_FAST_PDF = os.environ.get('AFGC_FAST_PDF', 'false').lower() == 'true'
+AFGC_JOBS = ARGS.jobs or os.cpu_count() or 1
+
+# Threads for manifest/ZIP writing when packs are rendered in-process
+IO_THREADS = 4
+
+# Replay mode: read records from a local JSON file instead of Airtable (no network I/O)
+RECORDS_JSON = ARGS.records_json
+RESULTS_JSON = Path('results.json')
+
+# Records awaiting an issuance pack (also applied within AIRTABLE_PENDING_VIEW)
+PENDING_FORMULA = "AND({Status}='Active', {Issue_Now}=TRUE(), {Issuance_Pack_Generated}!=TRUE())"
+
+# Certification_Registry columns read when building a pack
+CERT_FIELDS = [
+    'Certification_ID', 'Entity_Name', 'Jurisdiction', 'Issued_Date',
+    'Expiration_Date', 'High_Level_Scope', 'Entity_Type',
+]
+
+# Commit identity for the registry bot, passed via environment instead of `git config`
+GIT_IDENTITY = {
+    'GIT_AUTHOR_NAME': 'afgc-registry-bot',
+    'GIT_AUTHOR_EMAIL': 'bot@afgc-registry.local',
+    'GIT_COMMITTER_NAME': 'afgc-registry-bot',
+    'GIT_COMMITTER_EMAIL': 'bot@afgc-registry.local',
+}
+
+# Largest page Airtable returns per list request
+AIRTABLE_PAGE_SIZE = 100
 
 # GitHub Pages base URL
 GITHUB_PAGES_BASE = 'https://ttony106-source.github.io/afgc-registry'
 
-# Output directory for packs (committed to repo)
-PACKS_DIR = Path('packs')
+# Local cache for Airtable query results (only used with --use-cache / AFGC_USE_CACHE)
+CACHE_DIR = Path('.cache')
+
+# Last live Airtable response, replayable with --records-json (saved with --use-cache / AFGC_USE_CACHE)
+LAST_FETCH_PATH = CACHE_DIR / 'last_fetch.json'
+
+# Output directory for packs (committed to repo); replays write to a scratch copy under .cache/
+PACKS_DIR = CACHE_DIR / 'replay' / 'packs' if RECORDS_JSON else Path('packs')
+
+# Document metadata written into every pack
+PDF_AUTHOR = 'AFGC Registry System'
+PDF_PRODUCER = 'AFGC Issuance Pack Generator'
+
+# TrueType fonts to embed, as {font name: .ttf path}; the built-in Helvetica needs no entry
+PDF_FONTS = {}
+_FONTS_REGISTERED = False
+
+# ReportLab styles shared by every pack (built by _load_pdf_libs() on first use)
+_STYLES = _TITLE_STYLE = _SUBTITLE_STYLE = _TABLE_STYLE = _COL_WIDTHS = None
+
+
+def _missing_dependency(e: ImportError):
+    print(f"Missing dependency: {e}")
+    print("Install with: pip install pyairtable reportlab requests")
+    sys.exit(1)
+
+
+@lru_cache(maxsize=None)
+def _load_pdf_libs():
+    """Import ReportLab and build the shared styles.
+    
+    Deferred until a pack is actually generated so idle runs (no pending
+    records) skip the import cost.
+    """
+    global letter, inch, SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, canvas, XMP, simpleSplit
+    global _STYLES, _TITLE_STYLE, _SUBTITLE_STYLE, _TABLE_STYLE, _COL_WIDTHS
+    
+    try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.lib.utils import simpleSplit
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.pdfgen import canvas
+        from reportlab.pdfbase.pdfdoc import XMP
+    except ImportError as e:
+        _missing_dependency(e)
+    
+    _register_fonts()
+    
+    _STYLES = getSampleStyleSheet()
+    _TITLE_STYLE = ParagraphStyle(
+        'Title', parent=_STYLES['Heading1'],
+        fontSize=18, spaceAfter=30, alignment=1
+    )
+    _SUBTITLE_STYLE = ParagraphStyle(
+        'Subtitle', parent=_STYLES['Heading2'],
+        fontSize=14, spaceAfter=20, alignment=1
+    )
+    _TABLE_STYLE = TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 12),
+        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ])
+    _COL_WIDTHS = (2*inch, 4*inch)
+
+
+def _register_fonts():
+    """Register PDF_FONTS with ReportLab once per process so TTFs are parsed a single time."""
+    global _FONTS_REGISTERED
+    if _FONTS_REGISTERED:
+        return
+    
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    for name, path in PDF_FONTS.items():
+        pdfmetrics.registerFont(TTFont(name, path))
+    _FONTS_REGISTERED = True
+
+
+class HashingWriter(RawIOBase):
+    """Write-only stream that SHA-256 hashes bytes as they pass through to `f`.
+    
+    Not seekable, so zipfile streams entries with data descriptors instead of
+    seeking back to patch headers, and the digest always matches the file.
+    """
+    
+    def __init__(self, f):
+        self.f = f
+        self.h = hashlib.sha256()
+        self.bytes_written = 0
+    
+    def writable(self):
+        return True
+    
+    def write(self, b):
+        self.h.update(b)
+        n = self.f.write(b)
+        self.bytes_written += n
+        return n
+
+
+class CertPack(NamedTuple):
+    """The Certification_Registry fields needed to build one issuance pack."""
+    record_id: str
+    cert_id: str
+    entity_name: str
+    jurisdiction: str
+    issued: str
+    expiration: str
+    scope: str
+    entity_type: str
+
+
+def _pack_from_record(cert: dict) -> CertPack:
+    """Extract a CertPack from an Airtable record, applying the display defaults."""
+    fields = cert.get('fields', {})
+    return CertPack(
+        record_id=cert['id'],
+        cert_id=fields.get('Certification_ID', 'Unknown'),
+        entity_name=fields.get('Entity_Name', 'Unknown Entity'),
+        jurisdiction=fields.get('Jurisdiction', ''),
+        issued=fields.get('Issued_Date', ''),
+        expiration=fields.get('Expiration_Date', ''),
+        scope=fields.get('High_Level_Scope', ''),
+        entity_type=fields.get('Entity_Type', ''),
+    )
+
+
+def _cache_path(key: str) -> Path:
+    return CACHE_DIR / f'{key}.json'
+
+
+def get_airtable_table():
+    """Return the Certification_Registry table on a single pooled, retrying HTTPS session."""
+    try:
+        from pyairtable import Api, retry_strategy
+        from requests.adapters import HTTPAdapter
+    except ImportError as e:
+        _missing_dependency(e)
+    
+    retry = retry_strategy(status_forcelist=(429, 500, 502, 503, 504), backoff_factor=0.5, total=5)
+    # Retries are configured on the pooled adapter below, not by pyairtable's own session
+    api = Api(AIRTABLE_API_KEY, retry_strategy=None)
+    api.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=retry))
+    return api.table(AIRTABLE_BASE_ID, AIRTABLE_TABLE_ID)
+
+
+def _pending_query() -> dict:
+    """Return the table.all() parameters that select records pending issuance."""
+    query = {'fields': CERT_FIELDS, 'page_size': AIRTABLE_PAGE_SIZE, 'formula': PENDING_FORMULA}
+    if AIRTABLE_PENDING_VIEW:
+        query['view'] = AIRTABLE_PENDING_VIEW
+    return query
+
+
+def _pending_cache_path(query: dict) -> Path:
+    key = hashlib.sha256(json.dumps([AIRTABLE_TABLE_ID, query]).encode()).hexdigest()[:16]
+    return _cache_path(key)
 
 
 def get_pending_certifications(table):
-    """Fetch certifications that need issuance packs generated."""
-    formula = "AND({Status}='Active', {Issue_Now}=TRUE(), {Issuance_Pack_Generated}!=TRUE())"
-    return table.all(formula=formula)
+    """Fetch certifications that need issuance packs generated.
+    
+    With caching enabled, results younger than AFGC_CACHE_TTL seconds are
+    served from disk so workflow retries do not repeat the Airtable scan.
+    """
+    query = _pending_query()
+    if not AFGC_USE_CACHE:
+        return table.all(**query)
+    
+    cache_path = _pending_cache_path(query)
+    try:
+        if time.time() - cache_path.stat().st_mtime < AFGC_CACHE_TTL:
+            print(f"Using cached Airtable results: {cache_path}")
+            return json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        pass
+    
+    records = table.all(**query)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(records))
+    return records
+
+
+def clear_pending_cache():
+    """Drop the cached pending records once their Airtable status has been written.
+    
+    Otherwise a retry within AFGC_CACHE_TTL would reissue packs that were
+    already committed.
+    """
+    _pending_cache_path(_pending_query()).unlink(missing_ok=True)
+
+
+# Invariant parts of MANIFEST.txt
+_MANIFEST_HEADER = "AFGC Issuance Pack Manifest\n" + "=" * 50 + "\n"
+_MANIFEST_FILES_HEADER = "Pack Version: 1.1\n\nFiles:\n" + "-" * 30 + "\n"
+_MANIFEST_FOOTER = (
+    "Verification: Compare SHA-256 hashes to verify file integrity.\n"
+    f"Registry: {GITHUB_PAGES_BASE}/registry/"
+)
 
 
 def generate_manifest(cert_dir: Path, cert_id: str, files: list, timestamp: str):
     """Generate MANIFEST.txt for self-verifying pack."""
     manifest_path = cert_dir / 'MANIFEST.txt'
-    lines = [
-        f"AFGC Issuance Pack Manifest",
-        f"{'=' * 50}",
-        f"Certification ID: {cert_id}",
-        f"Generated UTC: {timestamp}",
-        f"Pack Version: 1.1",
-        f"",
-        f"Files:",
-        f"-" * 30,
-    ]
-    
-    for f in files:
-        lines.append(f"  {f['name']}")
-        lines.append(f"    SHA-256: {f['sha256']}")
-        lines.append(f"    Size: {f['size']} bytes")
-        lines.append(f"")
-    
-    lines.append(f"Verification: Compare SHA-256 hashes to verify file integrity.")
-    lines.append(f"Registry: {GITHUB_PAGES_BASE}/registry/")
-    
-    manifest_path.write_text('\n'.join(lines))
+    file_entries = ''.join(
+        f"  {f['name']}\n    SHA-256: {f['sha256']}\n    Size: {f['size']} bytes\n\n"
+        for f in files
+    )
+    body = (
+        f"Certification ID: {cert_id}\n"
+        f"Generated UTC: {timestamp}\n"
+        f"{_MANIFEST_FILES_HEADER}"
+        f"{file_entries}"
+    )
+    manifest_path.write_bytes((_MANIFEST_HEADER + body + _MANIFEST_FOOTER).encode('utf-8'))
     return manifest_path
 
 
@@ -83,236 +339,511 @@ def generate_zip(cert_dir: Path, cert_id: str, files_to_zip: list) -> tuple:
     zip_filename = f"{cert_id}_issuance_pack.zip"
     zip_path = cert_dir / zip_filename
     
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+    with open(zip_path, 'wb') as raw, HashingWriter(raw) as hw, zipfile.ZipFile(hw, 'w') as zf:
         for file_path in files_to_zip:
             if file_path.exists():
                 arcname = file_path.name
-                zf.write(file_path, arcname)
+                # PDF streams are already Flate-compressed; deflating them again gains nothing
+                if file_path.suffix == '.pdf':
+                    zf.write(file_path, arcname, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.write(file_path, arcname, compress_type=zipfile.ZIP_DEFLATED, compresslevel=6)
     
-    zip_sha256 = hashlib.sha256(zip_path.read_bytes()).hexdigest()
+    zip_sha256 = hw.h.hexdigest()
     return zip_path, zip_sha256
 
 
-def generate_pdf(cert_data: dict, output_path: Path) -> str:
-    """Generate a PDF/A-2b compliant issuance pack."""
-    fields = cert_data.get('fields', {})
-    cert_id = fields.get('Certification_ID', 'Unknown')
-    entity_name = fields.get('Entity_Name', 'Unknown Entity')
-    jurisdiction = fields.get('Jurisdiction', '')
-    issued_date = fields.get('Issued_Date', '')
-    expiration_date = fields.get('Expiration_Date', '')
-    scope = fields.get('High_Level_Scope', '')
-    entity_type = fields.get('Entity_Type', '')
-    
+def generate_pdf(pack: CertPack, output_path: Path, now_utc: datetime) -> tuple:
+    """Generate a PDF/A-2b compliant issuance pack and return (sha256, size in bytes)."""
+    _load_pdf_libs()
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
+    buf = BytesIO()
     doc = SimpleDocTemplate(
-        str(output_path),
+        buf,
         pagesize=letter,
         rightMargin=72, leftMargin=72,
         topMargin=72, bottomMargin=72
     )
     
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'Title', parent=styles['Heading1'],
-        fontSize=18, spaceAfter=30, alignment=1
-    )
-    subtitle_style = ParagraphStyle(
-        'Subtitle', parent=styles['Heading2'],
-        fontSize=14, spaceAfter=20, alignment=1
-    )
-    
     story = []
-    story.append(Paragraph("AI Fiduciary Governance Certification", title_style))
-    story.append(Paragraph("Official Issuance Pack", subtitle_style))
+    story.append(Paragraph("AI Fiduciary Governance Certification", _TITLE_STYLE))
+    story.append(Paragraph("Official Issuance Pack", _SUBTITLE_STYLE))
     story.append(Spacer(1, 0.5*inch))
     
     data = [
-        ['Certification ID:', cert_id],
-        ['Entity Name:', entity_name],
-        ['Entity Type:', entity_type],
-        ['Jurisdiction:', jurisdiction],
-        ['Issue Date:', issued_date],
-        ['Expiration Date:', expiration_date],
-        ['Scope:', scope],
+        ['Certification ID:', pack.cert_id],
+        ['Entity Name:', pack.entity_name],
+        ['Entity Type:', pack.entity_type],
+        ['Jurisdiction:', pack.jurisdiction],
+        ['Issue Date:', pack.issued],
+        ['Expiration Date:', pack.expiration],
+        ['Scope:', pack.scope],
     ]
     
-    table = Table(data, colWidths=[2*inch, 4*inch])
-    table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
+    table = Table(data, colWidths=_COL_WIDTHS, style=_TABLE_STYLE)
     story.append(table)
     story.append(Spacer(1, 0.5*inch))
     
-    timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
-    story.append(Paragraph(f"Generated: {timestamp}", styles['Normal']))
+    timestamp = now_utc.strftime('%Y-%m-%d %H:%M:%S UTC')
+    story.append(Paragraph(f"Generated: {timestamp}", _STYLES['Normal']))
     story.append(Spacer(1, 0.2*inch))
     story.append(Paragraph(
         "This document certifies compliance with AFGC governance standards.",
-        styles['Normal']
+        _STYLES['Normal']
     ))
-    story.append(Paragraph(f"Registry URL: {GITHUB_PAGES_BASE}/registry/", styles['Normal']))
+    story.append(Paragraph(f"Registry URL: {GITHUB_PAGES_BASE}/registry/", _STYLES['Normal']))
+    
+    doc.build(story, onFirstPage=lambda c, _doc: _apply_metadata(c, pack, now_utc))
+    
+    return _write_pdf(buf, output_path)
+
+
+def generate_pdf_fast(pack: CertPack, output_path: Path, now_utc: datetime) -> tuple:
+    """Generate the same one-page issuance pack by drawing directly on a canvas.
+    
+    Skips Platypus layout entirely; rows are placed at fixed positions and
+    values wider than the value column are wrapped onto extra lines (and
+    further pages if needed). Enabled with AFGC_FAST_PDF=true.
+    """
+    _load_pdf_libs()
+    rows = [
+        ('Certification ID:', pack.cert_id),
+        ('Entity Name:', pack.entity_name),
+        ('Entity Type:', pack.entity_type),
+        ('Jurisdiction:', pack.jurisdiction),
+        ('Issue Date:', pack.issued),
+        ('Expiration Date:', pack.expiration),
+        ('Scope:', pack.scope),
+    ]
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    page_width, page_height = letter
+    left = 72
+    label_x = left + _COL_WIDTHS[0] - 6
+    value_x = left + _COL_WIDTHS[0] + 6
+    value_width = _COL_WIDTHS[1] - 12
+    
+    y = page_height - 72 - 18
+    c.setFont('Helvetica-Bold', 18)
+    c.drawCentredString(page_width / 2, y, "AI Fiduciary Governance Certification")
+    y -= 18 + 30
+    c.setFont('Helvetica-Bold', 14)
+    c.drawCentredString(page_width / 2, y, "Official Issuance Pack")
+    y -= 20 + 0.5*inch
+    
+    for label, value in rows:
+        y -= 12 + 11
+        c.setFont('Helvetica-Bold', 11)
+        c.drawRightString(label_x, y, label)
+        c.setFont('Helvetica', 11)
+        lines = simpleSplit(str(value), 'Helvetica', 11, value_width) or ['']
+        for i, line in enumerate(lines):
+            if i:
+                y -= 11 * 1.2
+            # Long wrapped values continue on a new page rather than past the margin
+            if y < 72:
+                c.showPage()
+                c.setFont('Helvetica', 11)
+                y = page_height - 72 - 11
+            c.drawString(value_x, y, line)
+        y -= 12
+    y -= 0.5*inch
     
-    doc.build(story)
+    footer_height = 12 + 0.2*inch + 12 + 12
+    if y - footer_height < 72:
+        c.showPage()
+        y = page_height - 72
+    c.setFont('Helvetica', 10)
+    y -= 12
+    c.drawString(left, y, f"Generated: {now_utc.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    y -= 0.2*inch + 12
+    c.drawString(left, y, "This document certifies compliance with AFGC governance standards.")
+    y -= 12
+    c.drawString(left, y, f"Registry URL: {GITHUB_PAGES_BASE}/registry/")
     
-    pdfa_path = output_path.with_suffix('.pdfa.pdf')
-    with pikepdf.open(output_path) as pdf:
-        with pdf.open_metadata() as meta:
-            meta['dc:title'] = f'AFGC Certification - {cert_id}'
-            meta['dc:creator'] = 'AFGC Registry System'
-            meta['dc:description'] = f'Official issuance pack for {entity_name}'
-            meta['pdf:Producer'] = 'AFGC Issuance Pack Generator'
-            meta['xmp:CreateDate'] = datetime.now(timezone.utc).isoformat()
-        pdf.save(pdfa_path)
+    _apply_metadata(c, pack, now_utc)
+    c.showPage()
+    c.save()
     
-    pdfa_path.replace(output_path)
-    sha256_hash = hashlib.sha256(output_path.read_bytes()).hexdigest()
-    return sha256_hash
+    return _write_pdf(buf, output_path)
 
 
-def git_commit_packs():
-    """Commit generated packs to the repository."""
+def _xmp_packet(pack: CertPack, now_utc: datetime) -> bytes:
+    """Build the XMP metadata packet embedded in every issuance pack."""
+    title = escape(f'AFGC Certification - {pack.cert_id}')
+    description = escape(f'Official issuance pack for {pack.entity_name}')
+    date = now_utc.isoformat(timespec='seconds')
+    return (
+        '<?xpacket begin="\ufeff" id="W5M0MpCehiHzreSzNTczkc9d"?>\n'
+        '<x:xmpmeta xmlns:x="adobe:ns:meta/">\n'
+        ' <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">\n'
+        '  <rdf:Description rdf:about=""'
+        ' xmlns:dc="http://purl.org/dc/elements/1.1/"'
+        ' xmlns:pdf="http://ns.adobe.com/pdf/1.3/"'
+        ' xmlns:xmp="http://ns.adobe.com/xap/1.0/">\n'
+        f'   <dc:title><rdf:Alt><rdf:li xml:lang="x-default">{title}</rdf:li></rdf:Alt></dc:title>\n'
+        f'   <dc:creator><rdf:Seq><rdf:li>{PDF_AUTHOR}</rdf:li></rdf:Seq></dc:creator>\n'
+        f'   <dc:description><rdf:Alt><rdf:li xml:lang="x-default">{description}</rdf:li></rdf:Alt></dc:description>\n'
+        f'   <pdf:Producer>{PDF_PRODUCER}</pdf:Producer>\n'
+        f'   <xmp:CreatorTool>{PDF_AUTHOR}</xmp:CreatorTool>\n'
+        f'   <xmp:CreateDate>{date}</xmp:CreateDate>\n'
+        f'   <xmp:ModifyDate>{date}</xmp:ModifyDate>\n'
+        '  </rdf:Description>\n'
+        ' </rdf:RDF>\n'
+        '</x:xmpmeta>\n'
+        '<?xpacket end="w"?>'
+    ).encode('utf-8')
+
+
+def _apply_metadata(c, pack: CertPack, now_utc: datetime):
+    """Set the document info dictionary and XMP metadata stream on a ReportLab canvas.
+    
+    ReportLab stamps /CreationDate and /ModDate from its own clock when the
+    document is created; both are pinned to now_utc so they match the XMP dates.
+    This writes ReportLab internals, which is why the workflow pins its version.
+    """
+    c.setTitle(f'AFGC Certification - {pack.cert_id}')
+    c.setAuthor(PDF_AUTHOR)
+    c.setSubject(f'Official issuance pack for {pack.entity_name}')
+    c.setCreator(PDF_AUTHOR)
+    c.setProducer(PDF_PRODUCER)
+    ts = c._doc._timeStamp
+    ts.t = now_utc.timestamp()
+    ts.lt = now_utc.utctimetuple()
+    ts.YMDhms = tuple(ts.lt)[:6]
+    ts.dhh = ts.dmm = 0
+    ts.tzname = 'UTC'
+    xmp = _xmp_packet(pack, now_utc)
+    c.setCatalogEntry('Metadata', XMP(creator=lambda doc: xmp))
+
+
+def _write_pdf(buf: BytesIO, output_path: Path) -> tuple:
+    """Write a rendered PDF buffer to disk and return (sha256, size in bytes).
+    
+    The bytes go to a uniquely named sibling .pdf.tmp file that is moved into
+    place with os.replace, so a failure never leaves a partial PDF at
+    output_path and concurrent writers never share a temp file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, suffix='.pdf.tmp')
+    tmp_path = Path(tmp_name)
+    try:
+        with open(fd, 'wb') as raw, HashingWriter(raw) as hw:
+            hw.write(buf.getbuffer())
+        # mkstemp creates the file 0600; packs are published, so use normal file permissions
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return hw.h.hexdigest(), hw.bytes_written
+
+
+def render_pack_pdf(pack: CertPack, now_utc: datetime) -> dict:
+    """Render the issuance pack PDF for one certification (the CPU-bound stage).
+    
+    Failures are returned in the result under 'error' instead of being raised.
+    """
+    cert_id = pack.cert_id
+    result = {'record_id': pack.record_id, 'cert_id': cert_id, 'dispatch_at': now_utc.isoformat()}
+    
+    try:
+        output_path = PACKS_DIR / cert_id / f"{cert_id}_issuance_pack.pdf"
+        render_pdf = generate_pdf_fast if AFGC_FAST_PDF else generate_pdf
+        result['pdf_sha256'], result['pdf_size'] = render_pdf(pack, output_path, now_utc)
+        result['path'] = output_path
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def write_pack_files(result: dict, now_utc: datetime) -> dict:
+    """Write MANIFEST.txt and (optionally) the ZIP for a rendered pack (the I/O-bound stage)."""
+    if 'error' in result:
+        return result
+    
+    cert_id = result['cert_id']
+    output_path = result['path']
+    cert_dir = output_path.parent
+    
+    try:
+        # Generate MANIFEST.txt
+        timestamp = now_utc.strftime('%Y-%m-%d %H:%M:%S UTC')
+        manifest_files = [{'name': output_path.name, 'sha256': result['pdf_sha256'], 'size': result['pdf_size']}]
+        manifest_path = generate_manifest(cert_dir, cert_id, manifest_files, timestamp)
+        
+        # Generate ZIP archive
+        zip_path, zip_sha256 = None, None
+        if AFGC_GENERATE_ZIP:
+            files_to_zip = [output_path, manifest_path]
+            zip_path, zip_sha256 = generate_zip(cert_dir, cert_id, files_to_zip)
+    
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+    
+    result.update({
+        'zip_sha256': zip_sha256,
+        'manifest_path': manifest_path,
+        'zip_path': zip_path,
+    })
+    return result
+
+
+def generate_pack(pack: CertPack, now_utc: datetime) -> dict:
+    """Generate the PDF, MANIFEST.txt and (optionally) ZIP for one certification.
+    
+    Used for single-pack runs and inside pool workers; failures are returned
+    in the result under 'error' instead of being raised.
+    """
+    return write_pack_files(render_pack_pdf(pack, now_utc), now_utc)
+
+
+def generate_packs(packs: list, now_utc: datetime):
+    """Yield generate_pack results, fanning out to a process pool when it can help.
+    
+    A single pack (or AFGC_JOBS=1) runs in-process to avoid worker startup cost;
+    with several packs in-process, manifest/ZIP writing runs on a small thread
+    pool so it overlaps with rendering the next PDF.
+    """
+    if len(packs) == 1:
+        yield generate_pack(packs[0], now_utc)
+        return
+    
+    if AFGC_JOBS == 1:
+        with ThreadPoolExecutor(max_workers=IO_THREADS) as io_pool:
+            futures = []
+            for pack in packs:
+                futures.append(io_pool.submit(write_pack_files, render_pack_pdf(pack, now_utc), now_utc))
+            for future in as_completed(futures):
+                yield future.result()
+        return
+    
+    workers = min(AFGC_JOBS, len(packs))
+    print(f"Generating packs with {workers} worker(s)")
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(generate_pack, pack, now_utc): pack for pack in packs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. BrokenProcessPool after an OOM kill)
+                pack = futures[future]
+                result = {
+                    'record_id': pack.record_id, 'cert_id': pack.cert_id,
+                    'dispatch_at': now_utc.isoformat(), 'error': f'Worker failed: {e!r}',
+                }
+            yield result
+
+
+def git_commit_packs(paths: list, now_utc: datetime):
+    """Commit the given pack files to the repository.
+    
+    Only the listed paths are staged, so git does not rescan every
+    historical pack under packs/.
+    """
     if DRY_RUN:
         print("  [DRY RUN] Would commit packs to repository")
         return True
     
+    if RECORDS_JSON:
+        print(f"  [REPLAY] Packs left uncommitted in {PACKS_DIR}")
+        return True
+    
+    timestamp = now_utc.strftime('%Y-%m-%d %H:%M UTC')
+    message = f'Add issuance packs - {timestamp}'
+    
     try:
-        subprocess.run(['git', 'config', 'user.name', 'afgc-registry-bot'], check=True)
-        subprocess.run(['git', 'config', 'user.email', 'bot@afgc-registry.local'], check=True)
-        subprocess.run(['git', 'add', 'packs/'], check=True)
+        import pygit2
+    except ImportError:
+        pygit2 = None
+    if pygit2 is not None:
+        return _git_commit_pygit2(pygit2, paths, message)
+    
+    # Plumbing batch: paths go to update-index on stdin (no argv length limit), then
+    # write-tree/commit-tree/update-ref build the commit without porcelain overhead.
+    cmd = (
+        'git update-index --add -z --stdin && '
+        'tree=$(git write-tree) && '
+        'if [ "$tree" = "$(git rev-parse "HEAD^{tree}")" ]; then echo "nothing to commit"; exit 0; fi && '
+        f'commit=$(git commit-tree "$tree" -p HEAD -m {shlex.quote(message)}) && '
+        'git update-ref HEAD "$commit" && '
+        'git push -q --atomic'
+    )
+    env = {**os.environ, **GIT_IDENTITY, 'GIT_LFS_SKIP_SMUDGE': '1'}
+    stdin = ''.join(f'{p}\0' for p in paths)
+    result = subprocess.run(cmd, shell=True, input=stdin, check=False, capture_output=True, text=True, env=env)
+    
+    if 'nothing to commit' in result.stdout:
+        print("  No changes to commit")
+        return True
+    
+    if result.returncode != 0:
+        print(f"  Git error: {result.stderr.strip() or result.returncode}")
+        return False
+    
+    print("  Packs committed and pushed to repository")
+    return True
+
+
+def _git_commit_pygit2(pygit2, paths: list, message: str) -> bool:
+    """Stage and commit in-process with libgit2, leaving only `git push` as a subprocess.
+    
+    The push stays on the git CLI so it picks up the credentials actions/checkout configures.
+    """
+    try:
+        repo = pygit2.Repository('.')
+        workdir = Path(repo.workdir).resolve()
+        for p in paths:
+            repo.index.add(Path(p).resolve().relative_to(workdir).as_posix())
+        repo.index.write()
         
-        result = subprocess.run(['git', 'diff', '--cached', '--quiet'], capture_output=True)
-        if result.returncode == 0:
+        tree = repo.index.write_tree()
+        if tree == repo.head.peel(pygit2.Commit).tree_id:
             print("  No changes to commit")
             return True
         
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
-        subprocess.run(['git', 'commit', '-m', f'Add issuance packs - {timestamp}'], check=True)
-        subprocess.run(['git', 'push'], check=True)
-        print("  Packs committed and pushed to repository")
-        return True
-    
-    except subprocess.CalledProcessError as e:
+        sig = pygit2.Signature(GIT_IDENTITY['GIT_AUTHOR_NAME'], GIT_IDENTITY['GIT_AUTHOR_EMAIL'])
+        repo.create_commit('HEAD', sig, sig, message, tree, [repo.head.target])
+    except Exception as e:
+        # GitError, but also e.g. ValueError from relative_to or OSError from the index;
+        # report a failed commit so main() still writes the Airtable status back
         print(f"  Git error: {e}")
         return False
+    
+    env = {**os.environ, 'GIT_LFS_SKIP_SMUDGE': '1'}
+    result = subprocess.run(['git', 'push', '-q', '--atomic'], check=False, capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        print(f"  Git error: {result.stderr.strip() or result.returncode}")
+        return False
+    
+    print("  Packs committed and pushed to repository")
+    return True
 
 
-def update_airtable_record(table, record_id: str, cert_id: str, pdf_sha256: str, zip_sha256: str, success: bool, error_msg: str = None):
-    """Update Airtable record with issuance pack details."""
-    if DRY_RUN:
-        print(f"  [DRY RUN] Would update record {record_id}")
-        return
-    
+def build_update_fields(cert_id: str, pdf_sha256: str, zip_sha256: Optional[str], dispatch_at: str, success: bool, error_msg: str = None) -> dict:
+    """Build the Airtable status fields for a single issuance pack record."""
     pack_url = f"{GITHUB_PAGES_BASE}/packs/{cert_id}/{cert_id}_issuance_pack.pdf"
-    zip_url = f"{GITHUB_PAGES_BASE}/packs/{cert_id}/{cert_id}_issuance_pack.zip"
     
     if success:
-        table.update(record_id, {
+        fields = {
             'Issuance_Pack_Generated': True,
             'Issuance_Pack_URL': pack_url,
             'Issuance_Pack_SHA256': pdf_sha256,
-            'Issuance_Pack_ZIP_URL': zip_url,
             'Issuance_Dispatch_Status': 'Sent',
-            'Issuance_Dispatch_At': datetime.now(timezone.utc).isoformat(),
+            'Issuance_Dispatch_At': dispatch_at,
             'Issue_Now': False,
-        })
+        }
+        if zip_sha256:
+            fields['Issuance_Pack_ZIP_URL'] = f"{GITHUB_PAGES_BASE}/packs/{cert_id}/{cert_id}_issuance_pack.zip"
     else:
-        table.update(record_id, {
+        fields = {
             'Issuance_Dispatch_Status': 'Failed',
             'Issuance_Error_Log': error_msg or 'Unknown error',
-            'Issuance_Dispatch_At': datetime.now(timezone.utc).isoformat(),
-        })
+            'Issuance_Dispatch_At': dispatch_at,
+        }
+    return fields
+
+
+def update_airtable_records_bulk(table, updates: list):
+    """Apply Airtable updates with batch requests (pyairtable sends 10 records per request, the API maximum)."""
+    if DRY_RUN:
+        for update in updates:
+            print(f"  [DRY RUN] Would update record {update['id']}")
+        return
+    
+    if RECORDS_JSON:
+        RESULTS_JSON.write_text(json.dumps(updates, indent=2))
+        print(f"  [REPLAY] Wrote {len(updates)} update(s) to {RESULTS_JSON}")
+        return
+    
+    table.batch_update(updates, typecast=False)
 
 
 def main():
     """Main entry point."""
-    if not all([AIRTABLE_API_KEY, AIRTABLE_BASE_ID, AIRTABLE_TABLE_ID]):
+    if not RECORDS_JSON and not all([AIRTABLE_API_KEY, AIRTABLE_BASE_ID, AIRTABLE_TABLE_ID]):
         print("Error: Missing required environment variables")
         sys.exit(1)
     
     print("AFGC Issuance Pack Generator v1.2")
-    print(f"Mode: {'DRY RUN' if DRY_RUN else 'LIVE'}")
+    print(f"Mode: {'DRY RUN' if DRY_RUN else 'REPLAY' if RECORDS_JSON else 'LIVE'}")
     print(f"Output: {GITHUB_PAGES_BASE}/packs/")
     print("-" * 50)
     
-    api = Api(AIRTABLE_API_KEY)
-    table = api.table(AIRTABLE_BASE_ID, AIRTABLE_TABLE_ID)
+    if RECORDS_JSON:
+        table = None
+        pending = json.loads(Path(RECORDS_JSON).read_text())
+        print(f"Replaying records from {RECORDS_JSON}")
+    else:
+        table = get_airtable_table()
+        pending = get_pending_certifications(table)
+        if AFGC_USE_CACHE:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            LAST_FETCH_PATH.write_text(json.dumps(pending))
     
-    pending = get_pending_certifications(table)
     print(f"Found {len(pending)} certifications pending issuance packs")
     
     if not pending:
         print("No certifications to process.")
         return
     
+    _load_pdf_libs()
     PACKS_DIR.mkdir(parents=True, exist_ok=True)
     generated = []
     failed = []
     
-    for cert in pending:
-        record_id = cert['id']
-        fields = cert.get('fields', {})
-        cert_id = fields.get('Certification_ID', 'Unknown')
-        
-        print(f"\nProcessing: {cert_id}")
+    run_now = datetime.now(timezone.utc)
+    for item in generate_packs([_pack_from_record(cert) for cert in pending], run_now):
+        print(f"\nProcessing: {item['cert_id']}")
         
-        try:
-            cert_dir = PACKS_DIR / cert_id
-            output_path = cert_dir / f"{cert_id}_issuance_pack.pdf"
-            timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
-            
-            # Generate PDF
-            pdf_sha256 = generate_pdf(cert, output_path)
-            print(f"  Generated: {output_path}")
-            print(f"  PDF SHA256: {pdf_sha256}")
-            
-            # Generate MANIFEST.txt
-            file_size = output_path.stat().st_size
-            manifest_files = [{'name': output_path.name, 'sha256': pdf_sha256, 'size': file_size}]
-            manifest_path = generate_manifest(cert_dir, cert_id, manifest_files, timestamp)
-            print(f"  Manifest: {manifest_path}")
-            
-            # Generate ZIP archive
-            files_to_zip = [output_path, manifest_path]
-            zip_path, zip_sha256 = generate_zip(cert_dir, cert_id, files_to_zip)
-            print(f"  ZIP: {zip_path}")
-            print(f"  ZIP SHA256: {zip_sha256}")
-            
-            generated.append({
-                'record_id': record_id,
-                'cert_id': cert_id,
-                'pdf_sha256': pdf_sha256,
-                'zip_sha256': zip_sha256,
-                'path': output_path,
-            })
+        if 'error' in item:
+            print(f"  Error: {item['error']}")
+            failed.append(item)
+            continue
         
-        except Exception as e:
-            print(f"  Error: {e}")
-            failed.append({'record_id': record_id, 'cert_id': cert_id, 'error': str(e)})
+        print(f"  Generated: {item['path']}")
+        print(f"  PDF SHA256: {item['pdf_sha256']}")
+        print(f"  Manifest: {item['manifest_path']}")
+        if item['zip_path']:
+            print(f"  ZIP: {item['zip_path']}")
+            print(f"  ZIP SHA256: {item['zip_sha256']}")
+        generated.append(item)
+    
+    updates = []
     
     if generated:
         print(f"\nCommitting {len(generated)} pack(s) to repository...")
-        commit_success = git_commit_packs()
+        paths = []
+        for item in generated:
+            paths += [item['path'], item['manifest_path']]
+            if item['zip_path']:
+                paths.append(item['zip_path'])
+        commit_success = git_commit_packs(paths, run_now)
         
         for item in generated:
-            update_airtable_record(
-                table, item['record_id'], item['cert_id'],
-                item['pdf_sha256'], item['zip_sha256'], success=commit_success,
-                error_msg='Git commit failed' if not commit_success else None
-            )
-            print(f"  Updated: {item['cert_id']}")
+            updates.append({'id': item['record_id'], 'fields': build_update_fields(
+                item['cert_id'], item['pdf_sha256'], item['zip_sha256'], item['dispatch_at'],
+                success=commit_success, error_msg='Git commit failed' if not commit_success else None
+            )})
     
     for item in failed:
-        update_airtable_record(table, item['record_id'], item['cert_id'],
-                              pdf_sha256=None, zip_sha256=None, success=False, error_msg=item['error'])
+        updates.append({'id': item['record_id'], 'fields': build_update_fields(
+            item['cert_id'], pdf_sha256=None, zip_sha256=None, dispatch_at=item['dispatch_at'],
+            success=False, error_msg=item['error']
+        )})
+    
+    if updates:
+        print(f"\nUpdating {len(updates)} Airtable record(s)...")
+        update_airtable_records_bulk(table, updates)
+        if AFGC_USE_CACHE and not DRY_RUN and not RECORDS_JSON:
+            clear_pending_cache()
+        for item in generated:
+            print(f"  Updated: {item['cert_id']}")
     
     print(f"\n{'=' * 50}")
     print(f"Processing complete. Generated: {len(generated)}, Failed: {len(failed)}")